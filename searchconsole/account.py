@@ -24,9 +24,16 @@ class Account:
     <searchconsole.account.WebProperty(url='...')>
     """
 
+    __slots__ = (
+        'service', 'credentials', 'throttle', '_webproperties', '_by_url'
+    )
+
     def __init__(self, service, credentials):
         self.service = service
         self.credentials = credentials
+        self.throttle = query.Throttle()
+        self._webproperties = None
+        self._by_url = None
 
     @property
     def webproperties(self):
@@ -35,21 +42,44 @@ class Account:
         select a specific web property using an index or by indexing the
         account directly with the properties exact URI.
 
+        The list is fetched once and cached for the lifetime of the
+        account. Use `refresh` if web properties have been added or
+        removed since.
+
         Usage:
         >>> account.webproperties[0]
         <searchconsole.account.WebProperty(url='...')>
         """
-        raw_properties = self.service.sites().list().execute().get(
-            'siteEntry', [])
+        if self._webproperties is None:
+            raw_properties = self.service.sites().list().execute().get(
+                'siteEntry', [])
+
+            self._webproperties = [
+                WebProperty(raw, self) for raw in raw_properties
+            ]
+            self._by_url = {p.url: p for p in self._webproperties}
 
-        return [WebProperty(raw, self) for raw in raw_properties]
+        return self._webproperties
+
+    def refresh(self):
+        """
+        Discard the cached web property list and fetch it again.
+
+        Returns:
+            `list` of `searchconsole.account.WebProperty`
+        """
+        self._webproperties = None
+        self._by_url = None
+
+        return self.webproperties
 
     def __getitem__(self, item):
+        properties = self.webproperties
+
         if isinstance(item, str):
-            properties = [p for p in self.webproperties if p.url == item]
-            web_property = properties[0] if properties else None
+            web_property = self._by_url.get(item)
         else:
-            web_property = self.webproperties[item]
+            web_property = properties[item]
 
         return web_property
 
@@ -78,6 +108,8 @@ class WebProperty:
         'siteUnverifiedUser': 4
     }
 
+    __slots__ = ('account', 'raw', 'url', 'permission', 'query')
+
     def __init__(self, raw, account):
         self.account = account
         self.raw = raw
@@ -86,10 +118,13 @@ class WebProperty:
         self.query = query.Query(self)
 
     def __eq__(self, other):
-        if isinstance(self, other.__class__):
-            return self.__dict__ == other.__dict__
+        if isinstance(other, self.__class__):
+            return self.url == other.url
         return False
 
+    def __hash__(self):
+        return hash(self.url)
+
     def __repr__(self):
         return "<searchconsole.account.WebProperty(url='{site_url}')>".format(
             site_url=self.url
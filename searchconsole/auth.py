@@ -11,15 +11,117 @@ http://google-auth-oauthlib.readthedocs.io/en/latest/reference/google_auth_oauth
 """
 
 import collections.abc
+import functools
 import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from apiclient import discovery
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 
 from .account import Account
 
 
+_discovery_document = None
+
+_service_cache = {}
+
+
+def _authorized_http(credentials):
+    """ Build a fresh authorized HTTP client. httplib2 transports are
+    not safe to share between threads, so concurrent workers each need
+    one of their own. """
+    # Imported here rather than at module level to keep
+    # `import searchconsole` fast for callers that never build a service.
+    import google_auth_httplib2
+    import httplib2
+
+    return google_auth_httplib2.AuthorizedHttp(
+        credentials,
+        http=httplib2.Http(timeout=30)
+    )
+
+
+def _build_service(credentials):
+    """ Build the Search Console service for a set of credentials,
+    fetching and parsing the discovery document only once per process.
+    Subsequent calls rebuild the service from the cached document,
+    saving an HTTP round-trip per authentication.
+
+    Services are also cached per credential identity, so repeated
+    authentications with the same grant reuse the same service and its
+    kept-alive connections. Each service carries a single authorized
+    HTTP client, so TLS connections are reused across requests instead
+    of being re-established per call. """
+    global _discovery_document
+
+    # The token is part of the key so credentials without a refresh
+    # token (e.g. a flow run without offline access) never collide.
+    key = (credentials.client_id, credentials.refresh_token,
+           credentials.token)
+    service = _service_cache.get(key)
+
+    if service is not None:
+        return service
+
+    from apiclient import discovery
+
+    http = _authorized_http(credentials)
+
+    if _discovery_document is None:
+
+        service = discovery.build(
+            serviceName='searchconsole',
+            version='v1',
+            http=http,
+            cache_discovery=False,
+        )
+        _discovery_document = service._rootDesc
+
+    else:
+
+        service = discovery.build_from_document(
+            _discovery_document,
+            http=http
+        )
+
+    _service_cache[key] = service
+
+    return service
+
+
+def _load_json(path):
+    """ Parse a JSON file, using `orjson` when available for a faster
+    load on the authentication path. Repeated loads of an unchanged
+    file are served from a cache keyed on path and modification time. """
+    path = os.path.abspath(path)
+
+    return dict(_load_json_file(path, os.path.getmtime(path)))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_json_file(path, mtime):
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _dump_json(obj, path):
+    """ Serialize a mapping to a JSON file, using `orjson` when available. """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f)
+
+
 def authenticate(client_config, credentials=None, serialize=None, flow="web"):
     """
     The `authenticate` function will authenticate a user with the Google Search
@@ -79,8 +181,7 @@ def authenticate(client_config, credentials=None, serialize=None, flow="web"):
 
         if isinstance(credentials, str):
 
-            with open(credentials, 'r') as f:
-                credentials = json.load(f)
+            credentials = _load_json(credentials)
 
         credentials = Credentials(
             token=credentials['token'],
@@ -92,12 +193,7 @@ def authenticate(client_config, credentials=None, serialize=None, flow="web"):
             scopes=credentials['scopes']
         )
 
-    service = discovery.build(
-        serviceName='searchconsole',
-        version='v1',
-        credentials=credentials,
-        cache_discovery=False,
-    )
+    service = _build_service(credentials)
 
     if serialize:
 
@@ -113,8 +209,7 @@ def authenticate(client_config, credentials=None, serialize=None, flow="web"):
                 'scopes': credentials.scopes
             }
 
-            with open(serialize, 'w') as f:
-                json.dump(serialized, f)
+            _dump_json(serialized, serialize)
 
         else:
 
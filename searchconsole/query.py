@@ -1,14 +1,71 @@
 # encoding: utf-8
 
 import collections
+import concurrent.futures
+import functools
+import operator
+import threading
 import time
-from copy import deepcopy
-
-import googleapiclient.errors
 
 from . import utils
 
 
+# Imported lazily on first use; only Report.to_dataframe needs it.
+_pandas = None
+
+_OPERATORS = frozenset([
+    'equals', 'notEquals', 'contains', 'notContains',
+    'includingRegex', 'excludingRegex'
+])
+
+_GROUP_TYPES = frozenset(['and', 'or'])
+
+
+@functools.lru_cache(maxsize=64)
+def _row_type(columns):
+    """ Namedtuple creation compiles a new class, which is expensive to
+    repeat for every report chunk. Reports with the same columns share
+    one Row class. """
+    return collections.namedtuple('Row', columns)
+
+
+class Throttle:
+    """
+    Sliding-window rate limiter used to space out Search Analytics
+    requests.
+
+    Requests proceed immediately until `calls` requests have been made
+    within the last `period` seconds; beyond that, callers sleep just
+    long enough for the oldest request to leave the window. The
+    monotonic clock keeps the throttle immune to system clock
+    adjustments and a lock makes it safe to share between threads.
+    """
+
+    __slots__ = ('calls', 'period', '_window', '_lock')
+
+    def __init__(self, calls=10, period=1.0):
+        self.calls = calls
+        self.period = period
+        self._window = collections.deque()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+
+            while self._window and now - self._window[0] >= self.period:
+                self._window.popleft()
+
+            wait = 0
+            if len(self._window) >= self.calls:
+                wait = self.period - (now - self._window[0])
+                time.sleep(wait)
+
+            self._window.append(time.monotonic())
+
+        return wait
+
+
 class Query:
 
     """
@@ -42,7 +99,7 @@ class Query:
     <searchconsole.query.Report(rows=...)>
     """
 
-    _lock = 0
+    __slots__ = ('raw', 'meta', 'api', '_query_fn')
 
     def __init__(self, api, parameters=None, metadata=None):
         self.raw = {
@@ -52,6 +109,7 @@ class Query:
 
         self.meta = {}
         self.api = api
+        self._query_fn = None
 
         if parameters:
             self.raw.update(parameters)
@@ -59,14 +117,7 @@ class Query:
             self.meta.update(metadata)
 
     def _wait(self):
-
-        now = time.time()
-        elapsed = now - self._lock
-        wait = max(0, 1 - elapsed)
-        time.sleep(wait)
-        self._lock = time.time()
-
-        return wait
+        return self.api.account.throttle.wait()
 
     @utils.immutable
     def range(self, start=None, stop=None, months=0, days=0):
@@ -131,7 +182,8 @@ class Query:
             dimension (str): Dimension you would like to filter on.
             expression (str): The value you would like to filter.
             operator (str): The operator you would like to use to filter.
-                Possible values: equals, contains, notContains, includingRegex, excludingRegex.
+                Possible values: equals, notEquals, contains, notContains,
+                includingRegex, excludingRegex.
             group_type (str): The way in which you would like multiple filters
                 to combine. Note: currently only 'and' is supported by the API.
 
@@ -143,6 +195,16 @@ class Query:
             <searchconsole.query.Query(...)>
         """
 
+        if operator not in _OPERATORS:
+            raise ValueError(
+                "Filter operator '{}' not supported".format(operator)
+            )
+
+        if group_type not in _GROUP_TYPES:
+            raise ValueError(
+                "Filter group type '{}' not supported".format(group_type)
+            )
+
         dimension_filter = {
             'dimension': dimension,
             'expression': expression,
@@ -154,7 +216,11 @@ class Query:
             'filters': [dimension_filter]
         }
 
-        self.raw.setdefault('dimensionFilterGroups', []).append(filter_group)
+        # Copy-on-write: clones share the group list until a filter is
+        # actually added.
+        groups = list(self.raw.get('dimensionFilterGroups', []))
+        groups.append(filter_group)
+        self.raw['dimensionFilterGroups'] = groups
 
         return self
 
@@ -204,6 +270,33 @@ class Query:
 
         return self
 
+    @utils.immutable
+    def fields(self, fields):
+        """
+        Return a new query that asks the API for a partial response
+        containing only the specified fields, which can shrink response
+        payloads considerably when you do not need every column.
+
+        Metric columns missing from a partial response appear as None
+        in the report's rows. Keep `keys` in the selector whenever the
+        query has dimensions, as rows cannot be built without them.
+
+        Args:
+            fields (str): Partial-response selector in the standard
+                Google API format, e.g. 'rows(keys,clicks,impressions)'.
+
+        Returns:
+            `searchconsole.query.Query`
+
+        Usage:
+            >>> query.fields('rows(keys,clicks)')
+            <searchconsole.query.Query(...)>
+        """
+
+        self.meta['fields'] = fields
+
+        return self
+
     @utils.immutable
     def limit(self, *limit_):
         """
@@ -239,12 +332,15 @@ class Query:
         return self
 
     def clone(self):
-
+        # A shallow copy is enough: builder methods only assign
+        # top-level keys or replace nested values wholesale, never
+        # mutate them in place.
         query = self.__class__(
             api=self.api,
-            parameters=deepcopy(self.raw),
-            metadata=deepcopy(self.meta)
+            parameters={**self.raw},
+            metadata={**self.meta}
         )
+        query._query_fn = self._query_fn
 
         return query
 
@@ -257,7 +353,30 @@ class Query:
 
         return self
 
-    def get(self):
+    def get(self, concurrency=1):
+        """
+        Run the query, following pagination until the result set is
+        exhausted or the maximum set by `limit` is reached, and return
+        the complete report.
+
+        Args:
+            concurrency (int): Number of pages to fetch in parallel.
+                The default of 1 fetches pages one after another.
+                Higher values speculatively request batches of
+                consecutive pages at once, which can cut the wall time
+                of multi-page reports considerably. All requests still
+                share the same rate limit.
+
+        Returns:
+            `searchconsole.query.Report`
+
+        Usage:
+            >>> query.get()
+            <searchconsole.query.Report(rows=...)>
+        """
+
+        if concurrency > 1:
+            return self._get_concurrent(concurrency)
 
         report = None
         cursor = self
@@ -279,26 +398,105 @@ class Query:
 
         return report
 
+    def iter_rows(self):
+        """
+        Run the query and yield rows one page at a time, fetching only
+        as many pages as the consumer iterates through. Unlike `get`,
+        which materializes the complete report up front, stopping early
+        skips downloading the rest of the result set.
+
+        Yields:
+            Report rows, in API order.
+
+        Usage:
+            >>> rows = query.range('today', days=-7).dimension('date').iter_rows()
+            >>> next(rows)
+            Row(...)
+        """
+
+        cursor = self
+        limit = self.meta.get('limit', float('inf'))
+        count = 0
+
+        while True:
+            report = cursor.execute()
+
+            for row in report.rows:
+                yield row
+                count += 1
+                if count >= limit:
+                    return
+
+            if report.is_complete:
+                return
+
+            cursor = cursor.next()
+
+    def _get_concurrent(self, concurrency):
+        from . import auth
+
+        report = None
+        cursor = self
+        limit = self.meta.get('limit', float('inf'))
+
+        # The service's httplib2 transport is not thread-safe, so each
+        # worker thread gets an authorized client of its own.
+        credentials = getattr(self.api.account, 'credentials', None)
+        local = threading.local()
+
+        def fetch(page_query):
+            if credentials is not None and getattr(local, 'http', None) is None:
+                local.http = auth._authorized_http(credentials)
+            return page_query.execute(http=getattr(local, 'http', None))
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=concurrency) as executor:
+
+            while True:
+                cursors = []
+                for _ in range(concurrency):
+                    cursors.append(cursor)
+                    cursor = cursor.next()
+
+                chunks = executor.map(fetch, cursors)
+
+                for page_cursor, chunk in zip(cursors, chunks):
+                    if report:
+                        report.append(chunk.raw[0], page_cursor)
+                    else:
+                        report = chunk
+
+                    if report.is_complete or len(report.rows) >= limit:
+                        return report
+
     def build(self, copy=True):
 
         if copy:
-            raw = deepcopy(self.raw)
+            raw = utils.jsoncopy(self.raw)
         else:
             raw = self.raw
 
         return raw
 
-    def execute(self):
+    def execute(self, http=None):
 
         raw = self.build()
         url = self.api.url
 
-        try:
-            self._wait()
-            response = self.api.account.service.searchanalytics().query(
-                siteUrl=url, body=raw).execute()
-        except googleapiclient.errors.HttpError as e:
-            raise e
+        # Walking the discovery resource chain builds fresh proxy
+        # objects each time; one method reference serves every page.
+        if self._query_fn is None:
+            self._query_fn = (
+                self.api.account.service.searchanalytics().query
+            )
+
+        kwargs = {}
+        if 'fields' in self.meta:
+            kwargs['fields'] = self.meta['fields']
+
+        self._wait()
+        response = self._query_fn(
+            siteUrl=url, body=raw, **kwargs).execute(http=http)
 
         return Report(response, self)
 
@@ -332,6 +530,11 @@ class Report:
     [Row(...), ..., Row(...)]
     """
 
+    __slots__ = (
+        'raw', 'queries', 'dimensions', 'metrics', 'columns', 'Row',
+        'rows', 'is_complete', '_metric_get'
+    )
+
     def __init__(self, raw, query):
         self.raw = []
         self.queries = []
@@ -339,7 +542,15 @@ class Report:
         self.dimensions = query.raw.get('dimensions', [])
         self.metrics = self._build_metrics(query)
         self.columns = self.dimensions + self.metrics
-        self.Row = collections.namedtuple('Row', self.columns)
+        self.Row = _row_type(tuple(self.columns))
+        if 'fields' in query.meta:
+            # A partial response may omit metric columns entirely.
+            metrics = tuple(self.metrics)
+            self._metric_get = lambda row: tuple(
+                row.get(metric) for metric in metrics
+            )
+        else:
+            self._metric_get = operator.itemgetter(*self.metrics)
         self.rows = []
         self.append(raw, query)
 
@@ -355,14 +566,16 @@ class Report:
         self.raw.append(raw)
         self.queries.append(query)
 
-        step = query.raw.get('rowLimit', 25000)
         rows = raw.get('rows', [])
         self.is_complete = not rows
 
-        for row in self.raw[-1].get('rows', []):
-            row = row.copy()
-            dimensions = dict(zip(self.dimensions, row.pop('keys', [])))
-            self.rows.append(self.Row(**row, **dimensions))
+        Row = self.Row
+        metric_get = self._metric_get
+
+        self.rows.extend(
+            Row(*row.get('keys', ()), *metric_get(row))
+            for row in rows
+        )
 
     @property
     def first(self):
@@ -394,8 +607,11 @@ class Report:
         return "<searchconsole.query.Report(rows={rows})>".format(rows=len(self))
 
     def to_dict(self):
-        return [dict(row._asdict()) for row in self.rows]
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in self.rows]
 
     def to_dataframe(self):
-        import pandas
-        return pandas.DataFrame(self.rows)
+        global _pandas
+        if _pandas is None:
+            import pandas as _pandas
+        return _pandas.DataFrame.from_records(self.rows, columns=self.columns)